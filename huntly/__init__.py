@@ -1,16 +1,48 @@
 """Huntly package root.
 
-Centralized package init: load `.env` from the `config/` folder so modules
-can rely on environment variables when imported. Keep this file lightweight
-to avoid heavy side-effects on import.
+Centralized package init: parse `.env` from the `config/` folder once into a
+module-level dict so modules can read configuration through `get()` without
+hitting `os.environ` on every call. The values are also exported to
+`os.environ` (like `load_dotenv`) for libraries that read it directly, e.g.
+OPENAI_BASE_URL or HTTPS_PROXY. Keep this file lightweight to avoid heavy
+side-effects on import.
 """
+import os
 from pathlib import Path
-from dotenv import load_dotenv
+from dotenv import dotenv_values
 
 # Load .env from repository config/ if present
 dotenv_path = Path(__file__).resolve().parents[1] / "config" / ".env"
-if dotenv_path.exists():
-    load_dotenv(dotenv_path=dotenv_path)
+
+_ENV: dict = {}
+# Keys exported from `.env` (not set by the real environment), refreshed on reload
+_DOTENV_KEYS: set = set()
+
+
+def reload_env() -> None:
+    """Re-read `config/.env` and the process environment into the cache.
+
+    Real environment variables win over `.env` values (same precedence as
+    `load_dotenv` without `override`).
+    """
+    if dotenv_path.exists():
+        for key, val in dotenv_values(dotenv_path).items():
+            if val is not None and (key not in os.environ or key in _DOTENV_KEYS):
+                os.environ[key] = val
+                _DOTENV_KEYS.add(key)
+    _ENV.clear()
+    _ENV.update(os.environ)
+
+
+def get(key: str, default=None):
+    """Return a configuration value from the cached env, falling back to `os.environ`."""
+    val = _ENV.get(key)
+    if val is None:
+        return os.environ.get(key, default)
+    return val
+
+
+reload_env()
 
 __all__ = [
     "core",
@@ -18,4 +50,6 @@ __all__ = [
     "workana",
     "pipeline",
     "ai",
+    "get",
+    "reload_env",
 ]
@@ -0,0 +1,55 @@
+"""Entry point for Huntly (`python -m huntly`).
+
+Runs the Telegram bot and the scraper concurrently on a single asyncio event loop.
+"""
+import asyncio
+import signal
+from .core.aio import run
+from .core.validation import validate_config, sanity_check
+from rich.console import Console
+
+console = Console()
+
+def signal_handler(task: asyncio.Task) -> None:
+    """Handle shutdown signals gracefully by cancelling the running services."""
+    console.print("\n[bold red]Shutting down Huntly...[/bold red]")
+    task.cancel()
+
+async def _main():
+    # Imported after validation: the pipeline refuses to import without Telegram config
+    from .integrations import telegram_bot
+    from .pipeline import proposal_pipeline
+    from .workana import scraper
+
+    # Register signal handlers (not available on Windows event loops, where
+    # asyncio.run already turns Ctrl+C into a cancellation)
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, signal_handler, asyncio.current_task())
+        except (NotImplementedError, RuntimeError):
+            pass
+
+    await proposal_pipeline.start()
+
+    async with asyncio.TaskGroup() as tg:
+        tg.create_task(telegram_bot.run_async())
+        console.print("[dim]✓ Telegram bot started[/dim]")
+
+        tg.create_task(scraper.run_async())
+        console.print("[dim]✓ Starting Workana scraper...[/dim]")
+
+def main() -> None:
+    console.print("[bold green]Starting Huntly...[/bold green]")
+
+    # Validate configuration before starting services
+    validate_config()
+    sanity_check()
+
+    try:
+        run(_main())
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        pass
+
+if __name__ == "__main__":
+    main()
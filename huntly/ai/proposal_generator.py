@@ -1,7 +1,19 @@
-import os
-from openai import OpenAI
+import re
+from functools import lru_cache
+
+from .. import get as env_get
+
+_SIGNATURE = "Constantino Di Nisio"
+_SUB = re.compile(r"\[|\]|[Tt]u nombre")
+_MAP = {"[": "", "]": "", "Tu nombre": _SIGNATURE, "tu nombre": _SIGNATURE}
+
+
+@lru_cache(maxsize=1)
+def _client():
+    # Built on first use so importing this module stays cheap
+    from openai import OpenAI
+    return OpenAI(api_key=env_get("OPENAI_API_KEY"))
 
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 
 def generar_propuesta(job: dict) -> str:
     prompt = f"""
@@ -29,7 +41,7 @@ Estructura sugerida:
 - Firma: Constantino Di Nisio
 """
 
-    response = client.chat.completions.create(
+    response = _client().chat.completions.create(
         model="gpt-4.1-mini",
         messages=[
             {
@@ -50,8 +62,6 @@ Estructura sugerida:
 
     texto = response.choices[0].message.content.strip()
 
-    texto = texto.replace("[", "").replace("]", "")
-    texto = texto.replace("Tu nombre", "Constantino Di Nisio")
-    texto = texto.replace("tu nombre", "Constantino Di Nisio")
+    texto = _SUB.sub(lambda m: _MAP[m.group(0)], texto)
 
     return texto
@@ -0,0 +1,29 @@
+"""asyncio setup shared by Huntly's entry points."""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from .. import get as env_get
+
+# Threads behind asyncio.to_thread (OpenAI calls, SQLite, fetches, SMTP); the
+# stdlib default of cpu_count()+4 would mostly sit idle
+DEFAULT_EXECUTOR_WORKERS = 4
+
+
+def configure_loop(loop: asyncio.AbstractEventLoop | None = None) -> None:
+    loop = loop or asyncio.get_running_loop()
+    loop.set_default_executor(ThreadPoolExecutor(
+        max_workers=DEFAULT_EXECUTOR_WORKERS,
+        thread_name_prefix="huntly-exec",
+    ))
+    if (env_get("ASYNCIO_DEBUG") or "false").strip().lower() == "true":
+        # Warn about any callback that blocks the loop for more than 0.5s
+        loop.set_debug(True)
+        loop.slow_callback_duration = 0.5
+
+
+def run(coro):
+    """`asyncio.run` with `configure_loop` applied to the new loop first."""
+    async def _main():
+        configure_loop()
+        return await coro
+    return asyncio.run(_main())
@@ -0,0 +1,27 @@
+"""Shared HTTP session for Huntly core.
+
+A single `requests.Session` keeps TCP/TLS connections alive between calls and
+retries transient errors (429/5xx) with backoff, honouring `Retry-After`.
+"""
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+def new_session(pool_connections: int = 4, pool_maxsize: int = 16) -> requests.Session:
+    session = requests.Session()
+    retry = Retry(
+        total=3,
+        backoff_factor=1.5,
+        status_forcelist=[429, 500, 502, 503, 504],
+        respect_retry_after_header=True,
+    )
+    session.mount("https://", HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        max_retries=retry,
+    ))
+    return session
+
+
+SESSION = new_session()
@@ -1,9 +1,68 @@
 """Notifications utilities for Huntly core."""
+import asyncio
+import atexit
+import importlib.util
 import logging
 import smtplib
+import threading
+import time
 from email.mime.text import MIMEText
 from typing import Dict
-import requests
+
+from .http import SESSION
+from .rate import TELEGRAM_BUCKET as _TG_BUCKET
+
+
+# Authenticated SMTP sessions reused across emails, keyed by (server, port, user).
+# The lock also serializes sends: an SMTP connection is not thread-safe.
+_smtp_cache: Dict[tuple, smtplib.SMTP] = {}
+_smtp_lock = threading.Lock()
+
+
+def _smtp_key(cfg: Dict[str, str]) -> tuple:
+    return (cfg.get("smtp_server", ""), int(cfg.get("smtp_port", 0)), cfg.get("smtp_user", ""))
+
+
+def _drop_smtp(key: tuple) -> None:
+    server = _smtp_cache.pop(key, None)
+    if server is not None:
+        try:
+            server.close()
+        except Exception:
+            pass
+
+
+def _get_smtp(cfg: Dict[str, str]) -> smtplib.SMTP:
+    """Return a live cached SMTP session for `cfg` (caller holds `_smtp_lock`)."""
+    key = _smtp_key(cfg)
+    server = _smtp_cache.get(key)
+    if server is not None:
+        try:
+            if server.noop()[0] == 250:
+                return server
+        except (smtplib.SMTPException, OSError):
+            pass
+        _drop_smtp(key)
+
+    server = smtplib.SMTP(key[0], key[1], timeout=10)
+    server.ehlo()
+    if cfg.get("smtp_user"):
+        server.starttls()
+        server.ehlo()
+        server.login(cfg.get("smtp_user"), cfg.get("smtp_pass", ""))
+    _smtp_cache[key] = server
+    return server
+
+
+@atexit.register
+def _close_smtp() -> None:
+    with _smtp_lock:
+        for key, server in list(_smtp_cache.items()):
+            try:
+                server.quit()
+            except Exception:
+                _drop_smtp(key)
+        _smtp_cache.clear()
 
 
 def send_email(subject: str, body: str, cfg: Dict[str, str]) -> None:
@@ -12,25 +71,100 @@ def send_email(subject: str, body: str, cfg: Dict[str, str]) -> None:
         msg["Subject"] = subject
         msg["From"] = cfg.get("smtp_user", "")
         msg["To"] = cfg.get("email_to", "")
-        with smtplib.SMTP(cfg.get("smtp_server", ""), int(cfg.get("smtp_port", 0)), timeout=10) as server:
-            if cfg.get("smtp_user"):
-                server.starttls()
-                server.login(cfg.get("smtp_user"), cfg.get("smtp_pass", ""))
-            server.send_message(msg)
+        with _smtp_lock:
+            try:
+                _get_smtp(cfg).send_message(msg)
+            except smtplib.SMTPServerDisconnected:
+                # Server dropped the cached session between NOOP and send: reconnect once
+                _drop_smtp(_smtp_key(cfg))
+                _get_smtp(cfg).send_message(msg)
     except Exception as exc:
         logging.error(f"[NOTIFY] Email send failed: {exc}")
 
 
+TG_SEND_ATTEMPTS = 3
+
+
+def _tg_request(message: str, cfg: Dict[str, str]) -> tuple:
+    """URL and form payload of a sendMessage call (shared by the sync and async paths)."""
+    url = f"https://api.telegram.org/bot{cfg.get('tg_token')}/sendMessage"
+    payload = {
+        "chat_id": cfg.get("tg_chat"),
+        "text": message,
+        "parse_mode": "HTML"
+    }
+    return url, payload
+
+
+def _tg_retry_after(resp, attempt: int) -> float | None:
+    """Seconds to wait before retrying `resp` (requests or httpx), or None to stop."""
+    if resp.status_code != 429 or attempt >= TG_SEND_ATTEMPTS:
+        return None
+    # Telegram tells us how long to back off in parameters.retry_after
+    try:
+        return float(resp.json().get("parameters", {}).get("retry_after", attempt))
+    except ValueError:
+        return float(attempt)
+
+
 def send_telegram(message: str, cfg: Dict[str, str]) -> None:
     try:
-        url = f"https://api.telegram.org/bot{cfg.get('tg_token')}/sendMessage"
-        payload = {
-            "chat_id": cfg.get("tg_chat"),
-            "text": message,
-            "parse_mode": "HTML"
-        }
-        resp = requests.post(url, data=payload, timeout=10)
-        resp.raise_for_status()
+        url, payload = _tg_request(message, cfg)
+        for attempt in range(1, TG_SEND_ATTEMPTS + 1):
+            _TG_BUCKET.take()
+            resp = SESSION.post(url, data=payload, timeout=10)
+            retry_after = _tg_retry_after(resp, attempt)
+            if retry_after is not None:
+                time.sleep(retry_after)
+                continue
+            resp.raise_for_status()
+            return
+    except Exception as exc:
+        logging.error(f"[NOTIFY] Telegram send failed: {exc}")
+
+
+# One keep-alive httpx client per event loop for the async Telegram path
+# (HTTP/2 when `h2` is installed, so concurrent sends share one connection)
+_tg_client = None
+_tg_client_loop = None
+
+
+def _get_tg_client():
+    global _tg_client, _tg_client_loop
+    loop = asyncio.get_running_loop()
+    if _tg_client is None or _tg_client_loop is not loop or _tg_client.is_closed:
+        import httpx
+        _tg_client = httpx.AsyncClient(
+            http2=importlib.util.find_spec("h2") is not None,
+            limits=httpx.Limits(max_connections=10, max_keepalive_connections=10),
+            timeout=10,
+        )
+        _tg_client_loop = loop
+    return _tg_client
+
+
+async def aclose() -> None:
+    """Close the async Telegram client; call before the event loop shuts down."""
+    global _tg_client, _tg_client_loop
+    if _tg_client is not None:
+        await _tg_client.aclose()
+    _tg_client = _tg_client_loop = None
+
+
+async def send_telegram_async(message: str, cfg: Dict[str, str]) -> None:
+    """Async variant of `send_telegram` that never blocks the event loop."""
+    try:
+        url, payload = _tg_request(message, cfg)
+        client = _get_tg_client()
+        for attempt in range(1, TG_SEND_ATTEMPTS + 1):
+            await _TG_BUCKET.atake()
+            resp = await client.post(url, data=payload)
+            retry_after = _tg_retry_after(resp, attempt)
+            if retry_after is not None:
+                await asyncio.sleep(retry_after)
+                continue
+            resp.raise_for_status()
+            return
     except Exception as exc:
         logging.error(f"[NOTIFY] Telegram send failed: {exc}")
 
@@ -45,3 +179,16 @@ def notify(subject: str, body: str, cfg: Dict[str, any]) -> None:
     if cfg.get("notify_telegram"):
         full_msg = f"<b>{subject}</b>\n\n{body}"
         send_telegram(full_msg, cfg)
+
+
+async def notify_async(subject: str, body: str, cfg: Dict[str, any]) -> None:
+    """Async `notify`: SMTP runs in a worker thread, Telegram on the loop."""
+    if not cfg:
+        return
+
+    if cfg.get("notify_email"):
+        await asyncio.to_thread(send_email, subject, body, cfg)
+
+    if cfg.get("notify_telegram"):
+        full_msg = f"<b>{subject}</b>\n\n{body}"
+        await send_telegram_async(full_msg, cfg)
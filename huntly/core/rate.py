@@ -0,0 +1,49 @@
+"""Rate limiting helpers for Huntly core."""
+import asyncio
+import threading
+import time
+
+
+class TokenBucket:
+    """Thread-safe token bucket: refills `rate` tokens per second up to `capacity`.
+
+    `take()` blocks until enough tokens are available, so bursts above the
+    capacity are queued instead of rejected.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _try_take(self, n: float) -> float:
+        """Take `n` tokens if available; otherwise return the seconds to wait."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            if self._tokens >= n:
+                self._tokens -= n
+                return 0.0
+            return (n - self._tokens) / self.rate
+
+    def take(self, n: float = 1) -> None:
+        while True:
+            wait = self._try_take(n)
+            if not wait:
+                return
+            time.sleep(wait)
+
+    async def atake(self, n: float = 1) -> None:
+        """Async variant of `take()` that yields to the event loop while waiting."""
+        while True:
+            wait = self._try_take(n)
+            if not wait:
+                return
+            await asyncio.sleep(wait)
+
+
+# Telegram allows ~30 msg/s per bot; every sender shares this bucket
+TELEGRAM_BUCKET = TokenBucket(rate=25, capacity=25)
@@ -1,4 +1,5 @@
 import sqlite3
+import threading
 from datetime import datetime
 
 from pathlib import Path
@@ -8,47 +9,78 @@ repo_root = Path(__file__).resolve().parents[2]
 DATA_DIR = repo_root / "data"
 DB_PATH = str(DATA_DIR / "jobs.db")
 
+# One connection per process, opened on first use and shared across threads
+_conn = None
+_lock = threading.RLock()
+
 def _c():
-    # ensure data dir exists before connecting
-    Path(DB_PATH).parent.mkdir(parents=True, exist_ok=True)
-    return sqlite3.connect(DB_PATH)
+    global _conn
+    if _conn is None:
+        # ensure data dir exists before connecting
+        Path(DB_PATH).parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(DB_PATH, check_same_thread=False, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        _migrate(conn)
+        _conn = conn
+    return _conn
 
 def init_db():
+    """
+    Abre la conexión compartida; la migración corre una sola vez al abrirla.
+    """
+    with _lock:
+        _c()
+
+def _migrate(c: sqlite3.Connection):
     """
     Crea la tabla si no existe y agrega columnas nuevas si faltan.
     (Migración simple por ALTER TABLE)
     """
-    with _c() as c:
-        c.execute("""
-        CREATE TABLE IF NOT EXISTS jobs(
-            job_id TEXT PRIMARY KEY,
-            url TEXT,
-            title TEXT,
-            description TEXT,
-            budget TEXT,
-            date TEXT,
-            proposal TEXT,
-            status TEXT,
-            created_at TEXT
-        )
-        """)
-        c.commit()
+    c.execute("""
+    CREATE TABLE IF NOT EXISTS jobs(
+        job_id TEXT PRIMARY KEY,
+        url TEXT,
+        title TEXT,
+        description TEXT,
+        budget TEXT,
+        date TEXT,
+        proposal TEXT,
+        status TEXT,
+        created_at TEXT
+    )
+    """)
+
+    existing_cols = set()
+    for row in c.execute("PRAGMA table_info(jobs)"):
+        existing_cols.add(row[1])
+
+    def add_col(name: str, coldef: str):
+        if name not in existing_cols:
+            c.execute(f"ALTER TABLE jobs ADD COLUMN {name} {coldef}")
 
-        existing_cols = set()
-        for row in c.execute("PRAGMA table_info(jobs)"):
-            existing_cols.add(row[1])
+    add_col("description", "TEXT")
+    add_col("budget", "TEXT")
+    add_col("date", "TEXT")
+    add_col("proposal", "TEXT")
+    add_col("status", "TEXT")
+    add_col("created_at", "TEXT")
 
-        def add_col(name: str, coldef: str):
-            if name not in existing_cols:
-                c.execute(f"ALTER TABLE jobs ADD COLUMN {name} {coldef}")
-                c.commit()
+    c.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status)")
 
-        add_col("description", "TEXT")
-        add_col("budget", "TEXT")
-        add_col("date", "TEXT")
-        add_col("proposal", "TEXT")
-        add_col("status", "TEXT")
-        add_col("created_at", "TEXT")
+# Real upsert (SQLite >= 3.24): keeps created_at and only rewrites the listed columns
+_UPSERT_SQL = """
+INSERT INTO jobs
+(job_id, url, title, description, budget, date, proposal, status, created_at)
+VALUES (?,?,?,?,?,?,?,?,?)
+ON CONFLICT(job_id) DO UPDATE SET
+    title=excluded.title,
+    description=excluded.description,
+    budget=excluded.budget,
+    date=excluded.date,
+    proposal=excluded.proposal,
+    status=excluded.status
+"""
 
 def upsert_job(
     job_id: str,
@@ -60,13 +92,8 @@ def upsert_job(
     proposal: str = "",
     status: str = "pending_interest",
 ):
-    init_db()
-    with _c() as c:
-        c.execute("""
-        INSERT OR REPLACE INTO jobs
-        (job_id, url, title, description, budget, date, proposal, status, created_at)
-        VALUES (?,?,?,?,?,?,?,?,?)
-        """, (
+    with _lock:
+        _c().execute(_UPSERT_SQL, (
             job_id,
             url,
             title,
@@ -77,45 +104,86 @@ def upsert_job(
             status,
             datetime.utcnow().isoformat()
         ))
-        c.commit()
+
+def upsert_jobs_batch(jobs: list[dict]):
+    """
+    Inserta/actualiza varios trabajos en una sola transacción (un solo commit).
+    Cada dict usa las mismas claves que los parámetros de upsert_job.
+    """
+    if not jobs:
+        return
+    now = datetime.utcnow().isoformat()
+    rows = [(
+        j["job_id"],
+        j["url"],
+        j["title"],
+        j.get("description", ""),
+        j.get("budget", ""),
+        j.get("date", ""),
+        j.get("proposal", ""),
+        j.get("status", "pending_interest"),
+        now,
+    ) for j in jobs]
+    with _lock:
+        c = _c()
+        c.execute("BEGIN")
+        try:
+            c.executemany(_UPSERT_SQL, rows)
+        except Exception:
+            c.execute("ROLLBACK")
+            raise
+        c.execute("COMMIT")
+
+def existing_job_ids(job_ids: list[str]) -> set[str]:
+    """
+    Devuelve cuáles de los job_ids ya están guardados (lectura por clave primaria,
+    sin escribir en el WAL).
+    """
+    found = set()
+    ids = list(job_ids)
+    with _lock:
+        c = _c()
+        # Lotes por debajo del límite de parámetros de SQLite
+        for i in range(0, len(ids), 500):
+            chunk = ids[i:i + 500]
+            marks = ",".join("?" * len(chunk))
+            found.update(r[0] for r in c.execute(
+                f"SELECT job_id FROM jobs WHERE job_id IN ({marks})", chunk
+            ))
+    return found
 
 def get_job(job_id: str):
-    init_db()
-    with _c() as c:
-        row = c.execute("""
+    with _lock:
+        row = _c().execute("""
             SELECT job_id, url, title, description, budget, date, proposal, status
             FROM jobs
             WHERE job_id=?
         """, (job_id,)).fetchone()
 
-        if not row:
-            return None
+    if not row:
+        return None
 
-        return {
-            "job_id": row[0],
-            "url": row[1],
-            "title": row[2],
-            "description": row[3] or "",
-            "budget": row[4] or "",
-            "date": row[5] or "",
-            "proposal": row[6] or "",
-            "status": row[7] or "",
-        }
+    return {
+        "job_id": row[0],
+        "url": row[1],
+        "title": row[2],
+        "description": row[3] or "",
+        "budget": row[4] or "",
+        "date": row[5] or "",
+        "proposal": row[6] or "",
+        "status": row[7] or "",
+    }
 
 def set_status(job_id: str, status: str):
-    init_db()
-    with _c() as c:
-        c.execute(
+    with _lock:
+        _c().execute(
             "UPDATE jobs SET status=? WHERE job_id=?",
             (status, job_id)
         )
-        c.commit()
 
 def set_proposal(job_id: str, proposal: str, status: str = "pending_send"):
-    init_db()
-    with _c() as c:
-        c.execute(
+    with _lock:
+        _c().execute(
             "UPDATE jobs SET proposal=?, status=? WHERE job_id=?",
             (proposal, status, job_id)
         )
-        c.commit()
@@ -1,16 +1,17 @@
-import os
 import asyncio
 import html as html_lib
 import logging
  
-from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
+from telegram import Update
 from telegram.ext import Application, CallbackQueryHandler, ContextTypes
 from telegram.constants import ParseMode
 from telegram.error import Conflict, NetworkError
 
+from .. import get as env_get
+from ..core.aio import run
 from ..core.storage import get_job, set_status, set_proposal
 from ..ai.proposal_generator import generar_propuesta
-from ..workana.sender import send_proposal_to_workana
+from ..workana.sender import send_proposal_to_workana, close_browser
 
 # Configure logging
 logging.basicConfig(
@@ -18,34 +19,37 @@ logging.basicConfig(
     level=logging.INFO
 )
 
-def keyboard_send(job_id: str) -> InlineKeyboardMarkup:
-    return InlineKeyboardMarkup([[
-        InlineKeyboardButton("✅ Enviar propuesta", callback_data=f"OK|{job_id}"),
-        InlineKeyboardButton("❌ Ignorar", callback_data=f"NO|{job_id}")
-    ]])
+# Pre-serialized reply_markup JSON; PTB sends a str reply_markup untouched
+_SEND_TPL = '{{"inline_keyboard":[[{{"text":"✅ Enviar propuesta","callback_data":"OK|{jid}"}},{{"text":"❌ Ignorar","callback_data":"NO|{jid}"}}]]}}'
+_INTEREST_TPL = '{{"inline_keyboard":[[{{"text":"⭐ Me interesa","callback_data":"INT|{jid}"}},{{"text":"❌ Ignorar","callback_data":"NO|{jid}"}}]]}}'
 
-def keyboard_interest(job_id: str) -> InlineKeyboardMarkup:
-    return InlineKeyboardMarkup([[
-        InlineKeyboardButton("⭐ Me interesa", callback_data=f"INT|{job_id}"),
-        InlineKeyboardButton("❌ Ignorar", callback_data=f"NO|{job_id}")
-    ]])
+def keyboard_send(job_id: str) -> str:
+    return _SEND_TPL.format(jid=job_id)
 
-def build_message_with_proposal(job: dict) -> str:
-    title = html_lib.escape(job.get("title", ""))
-    budget = html_lib.escape(job.get("budget", "") or "")
-    date = html_lib.escape(job.get("date", "") or "")
-    url = job.get("url", "") or ""
-    desc = html_lib.escape(job.get("description", "") or "")
-    proposal = html_lib.escape(job.get("proposal", "") or "")
+def keyboard_interest(job_id: str) -> str:
+    return _INTEREST_TPL.format(jid=job_id)
+
+_HTML_CHARS = frozenset("&<>\"'")
+
+def _esc(s: str) -> str:
+    # Most titles/URLs have nothing to escape; skip html.escape's replace chain then
+    return html_lib.escape(s) if not _HTML_CHARS.isdisjoint(s) else s
 
-    proposal = proposal[:3000]
+def build_message_with_proposal(job: dict) -> str:
+    title = _esc(job.get("title", ""))
+    budget = _esc(job.get("budget", "") or "")
+    date = _esc(job.get("date", "") or "")
+    url = _esc(job.get("url", "") or "")
+    desc = _esc(job.get("description", "") or "")
+    # Truncate before escaping: no wasted work on the tail and no entity cut in half
+    proposal = _esc((job.get("proposal", "") or "")[:3000])
 
     return (
         "🆕 <b>¡Nuevo Trabajo Encontrado! 🚀</b>\n\n"
         f"💼 <b>Título:</b> {title}\n"
         f"💰 <b>Presupuesto:</b> {budget}\n"
         f"📅 <b>Fecha:</b> {date}\n"
-        f"🔗 <b>Link:</b> <a href=\"{html_lib.escape(url)}\">{html_lib.escape(url)}</a>\n\n"
+        f"🔗 <b>Link:</b> <a href=\"{url}\">{url}</a>\n\n"
         "📝 <b>Descripción:</b>\n"
         f"{desc}\n\n"
         "✍️ <b>Propuesta:</b>\n"
@@ -70,8 +74,6 @@ async def on_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
         return
 
     if action == "INT":
-        job = get_job(job_id) or job
-
         if (job.get("proposal") or "").strip():
             await query.edit_message_text(
                 text=build_message_with_proposal(job),
@@ -92,13 +94,17 @@ async def on_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
             "url": job.get("url", "")
         }
 
-        maybe = generar_propuesta(payload)
-        proposal = await maybe if asyncio.iscoroutine(maybe) else maybe
+        # The OpenAI call is blocking: run it in a worker thread so other
+        # callbacks keep being served meanwhile
+        if asyncio.iscoroutinefunction(generar_propuesta):
+            proposal = await generar_propuesta(payload)
+        else:
+            proposal = await asyncio.to_thread(generar_propuesta, payload)
         proposal = (proposal or "").strip()
 
         set_proposal(job_id, proposal, status="pending_send")
-        job = get_job(job_id) or job
         job["proposal"] = proposal
+        job["status"] = "pending_send"
 
         await query.edit_message_text(
             text=build_message_with_proposal(job),
@@ -109,7 +115,6 @@ async def on_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
         return
 
     if action == "OK":
-        job = get_job(job_id) or job
         proposal = (job.get("proposal") or "").strip()
 
         if not proposal:
@@ -148,21 +153,39 @@ async def error_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
     
     logging.error(f"Update {update} caused error {error}")
 
-def main():
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-
-    token = (os.getenv("TG_BOT_TOKEN") or os.getenv("TG_TOKEN") or "").strip()
+def build_application() -> Application:
+    token = (env_get("TG_BOT_TOKEN") or env_get("TG_TOKEN") or "").strip()
     if not token:
         raise RuntimeError("❌ Falta TG_BOT_TOKEN (o TG_TOKEN) en el archivo .env")
 
     app = Application.builder().token(token).build()
     app.add_handler(CallbackQueryHandler(on_callback))
     app.add_error_handler(error_handler)
+    return app
+
+async def run_async():
+    """Poll Telegram on the current event loop until cancelled."""
+    app = build_application()
 
     print("🤖 Bot de Telegram iniciado. Esperando acciones...")
 
-    app.run_polling(close_loop=False, stop_signals=None)
+    async with app:
+        await app.start()
+        await app.updater.start_polling()
+        try:
+            await asyncio.Event().wait()
+        finally:
+            if app.updater.running:
+                await app.updater.stop()
+            if app.running:
+                await app.stop()
+            await close_browser()
+
+def main():
+    try:
+        run(run_async())
+    except KeyboardInterrupt:
+        pass
 
 if __name__ == "__main__":
     main()
@@ -1,29 +1,43 @@
-import os
+import re
 import html
 import hashlib
 import asyncio
-import threading
+import importlib.util
+from functools import lru_cache
 
-from bs4 import BeautifulSoup
-
-from telegram import Bot, InlineKeyboardButton, InlineKeyboardMarkup
+from telegram import Bot
 from telegram.constants import ParseMode
 from telegram.request import HTTPXRequest
 
-from ..core.storage import upsert_job
+from .. import get as env_get
+from ..core.rate import TELEGRAM_BUCKET
+from ..core.storage import existing_job_ids, upsert_jobs_batch
 
 
-TG_BOT_TOKEN = (os.getenv("TG_BOT_TOKEN") or os.getenv("TG_TOKEN") or "").strip()
-TG_CHAT_ID = (os.getenv("TG_CHAT_ID") or os.getenv("TG_CHAT") or "").strip()
+TG_BOT_TOKEN = (env_get("TG_BOT_TOKEN") or env_get("TG_TOKEN") or "").strip()
+TG_CHAT_ID = (env_get("TG_CHAT_ID") or env_get("TG_CHAT") or "").strip()
 
 def telegram_enabled() -> bool:
-    return os.getenv("NOTIFY_TELEGRAM", "false").strip().lower() == "true"
+    return env_get("NOTIFY_TELEGRAM", "false").strip().lower() == "true"
 
 if not TG_BOT_TOKEN or not TG_CHAT_ID:
     raise RuntimeError("❌ Falta TG_BOT_TOKEN/TG_TOKEN o TG_CHAT_ID/TG_CHAT en el .env")
 
+_TAG_RE = re.compile(r"<[^>]+>")
+_WS_RE = re.compile(r"\s+")
+
+POOL_SIZE = 20
+# Each worker has at most one request in flight; keep <= POOL_SIZE to avoid "Pool timeout"
+SENDER_WORKERS = 8
+# Bounded so a burst of jobs blocks handle_new_jobs; the scraper caps the pages
+# awaiting it (MAX_PENDING_PAGES), so pagination waits too
+QUEUE_MAXSIZE = 50
+QUEUE_LOG_EVERY = 25
+
+# HTTP/2 multiplexes concurrent sends over one TLS connection; needs `h2` (requirements.txt)
 _request = HTTPXRequest(
-    connection_pool_size=10,
+    connection_pool_size=POOL_SIZE,
+    http_version="2" if importlib.util.find_spec("h2") else "1.1",
     pool_timeout=20.0,
     connect_timeout=15.0,
     read_timeout=30.0,
@@ -31,15 +45,10 @@ _request = HTTPXRequest(
 )
 bot = Bot(token=TG_BOT_TOKEN, request=_request)
 
-_loop = asyncio.new_event_loop()
-_queue: "asyncio.Queue[tuple[dict, str]]" = asyncio.Queue()
-
-def _loop_runner():
-    asyncio.set_event_loop(_loop)
-    _loop.run_forever()
-
-_thread = threading.Thread(target=_loop_runner, daemon=True)
-_thread.start()
+# Sender state lives on whichever event loop runs the app (see start())
+_queue: "asyncio.Queue[tuple[dict, str]] | None" = None
+_workers: "list[asyncio.Task]" = []
+_enqueued = 0
 
 async def _sender_worker():
     while True:
@@ -51,51 +60,92 @@ async def _sender_worker():
         finally:
             _queue.task_done()
 
-def _start_worker():
-    _loop.create_task(_sender_worker())
-
-_loop.call_soon_threadsafe(_start_worker)
-
+async def start():
+    """Start the Telegram sender workers on the running loop (idempotent)."""
+    global _queue, _workers
+    loop = asyncio.get_running_loop()
+    if _workers and all(not t.done() for t in _workers) and _workers[0].get_loop() is loop:
+        return
+    for t in _workers:
+        t.cancel()
+    # The bot's httpx client is bound to the loop it was used on; aclose() shuts it
+    # down at the end of a run and this rebuilds it for the new one
+    await _request.initialize()
+    _queue = asyncio.Queue(maxsize=QUEUE_MAXSIZE)
+    _workers = [loop.create_task(_sender_worker()) for _ in range(SENDER_WORKERS)]
+
+async def drain(timeout: float = 60.0):
+    """Wait (up to `timeout` seconds) until queued Telegram messages are sent."""
+    if _queue is None:
+        return
+    try:
+        await asyncio.wait_for(_queue.join(), timeout)
+    except asyncio.TimeoutError:
+        print(f"[proposal_pipeline] ⚠️ Quedaron {_queue.qsize()} mensajes sin enviar")
+
+async def aclose():
+    """Stop the sender workers and close the bot's HTTP client before the loop ends."""
+    global _queue, _workers
+    for t in _workers:
+        t.cancel()
+    _queue, _workers = None, []
+    await _request.shutdown()
+
+@lru_cache(maxsize=4096)
 def make_job_id(url: str) -> str:
+    # 6-byte digest == 12 hex chars, same width as the old truncated SHA-1
+    return hashlib.blake2s(url.encode("utf-8"), digest_size=6).hexdigest()
+
+def make_job_id_legacy(url: str) -> str:
+    """ID used before the blake2s switch; rows and buttons created back then still carry it."""
     return hashlib.sha1(url.encode("utf-8")).hexdigest()[:12]
 
-def keyboard_interest(job_id: str) -> InlineKeyboardMarkup:
-    return InlineKeyboardMarkup([[
-        InlineKeyboardButton("⭐ Me interesa", callback_data=f"INT|{job_id}"),
-        InlineKeyboardButton("❌ Ignorar", callback_data=f"NO|{job_id}")
-    ]])
+# Pre-serialized reply_markup: PTB forwards a str as-is, skipping to_dict()/json per send
+_INTEREST_TPL = '{{"inline_keyboard":[[{{"text":"⭐ Me interesa","callback_data":"INT|{jid}"}},{{"text":"❌ Ignorar","callback_data":"NO|{jid}"}}]]}}'
+
+def keyboard_interest(job_id: str) -> str:
+    return _INTEREST_TPL.format(jid=job_id)
 
+@lru_cache(maxsize=4096)
 def strip_html(text: str) -> str:
     if not text:
         return ""
+    stripped = _TAG_RE.sub(" ", text)
+    if "<" not in stripped:
+        return _WS_RE.sub(" ", html.unescape(stripped)).strip()
+    # Unclosed/odd markup left over: let a real parser deal with it
     try:
+        from bs4 import BeautifulSoup
         return BeautifulSoup(text, "html.parser").get_text(" ", strip=True)
     except Exception:
         return text.replace("<br/>", " ").replace("<br />", " ").replace("\n", " ").strip()
 
+_MSG_TEMPLATE = (
+    "🆕 <b>¡Nuevo Trabajo Encontrado! 🚀</b>\n\n"
+    "💼 <b>Título:</b> %s\n"
+    "💰 <b>Presupuesto:</b> %s\n"
+    "📅 <b>Fecha:</b> %s\n"
+    "🔗 <b>Link:</b> <a href=\"%s\">%s</a>\n\n"
+    "📝 <b>Descripción:</b>\n"
+    "%s"
+)
+
 def build_message_no_proposal(job: dict) -> str:
-    title = strip_html(job.get("title", ""))
-    budget = strip_html(job.get("budget", "") or "")
-    date = strip_html(job.get("date", "") or "")
-    url = (job.get("url", "") or "").strip()
+    """Render a `_normalize_job` result (fields are already plain text)."""
+    esc = html.escape
+    url = esc(job["url"])
 
-    desc_plain = strip_html(job.get("short_description", "") or "")
+    desc_plain = job["description"]
     if len(desc_plain) > 1200:
         desc_plain = desc_plain[:1200].rstrip() + "..."
 
-    return (
-        "🆕 <b>¡Nuevo Trabajo Encontrado! 🚀</b>\n\n"
-        f"💼 <b>Título:</b> {html.escape(title)}\n"
-        f"💰 <b>Presupuesto:</b> {html.escape(budget)}\n"
-        f"📅 <b>Fecha:</b> {html.escape(date)}\n"
-        f"🔗 <b>Link:</b> <a href=\"{html.escape(url)}\">{html.escape(url)}</a>\n\n"
-        "📝 <b>Descripción:</b>\n"
-        f"{html.escape(desc_plain)}"
-    )
+    # URL escaped once and reused for href + text
+    return _MSG_TEMPLATE % (esc(job["title"]), esc(job["budget"]), esc(job["date"]), url, url, esc(desc_plain))
 
 async def _send_interest(job: dict, job_id: str):
     for attempt in range(1, 4):
         try:
+            await TELEGRAM_BUCKET.atake()
             await bot.send_message(
                 chat_id=TG_CHAT_ID,
                 text=build_message_no_proposal(job),
@@ -110,33 +160,49 @@ async def _send_interest(job: dict, job_id: str):
                 return
             await asyncio.sleep(attempt)
 
-def handle_new_job(job: dict):
-    url = (job.get("url") or "").strip()
-    if not url or not url.startswith("http"):
+def _normalize_job(job: dict) -> dict | None:
+    """Clean a scraped job once; the result feeds both the DB row and the Telegram message."""
+    url = (job.get("url") or "").strip().split("?", 1)[0]
+    if not url.startswith("http"):
+        return None
+    return {
+        "job_id": make_job_id(url),
+        "url": url,
+        "title": strip_html(job.get("title") or ""),
+        "description": strip_html(job.get("short_description") or ""),
+        "budget": strip_html(job.get("budget") or ""),
+        "date": strip_html(job.get("date") or ""),
+    }
+
+async def handle_new_jobs(jobs: list[dict]):
+    """Store a batch of scraped jobs in one transaction and queue their Telegram messages."""
+    candidates = [n for n in map(_normalize_job, jobs) if n]
+    if not candidates:
         return
 
-    url = url.split("?")[0]
+    # Jobs already in the DB (under the current or the pre-blake2s id) were
+    # stored and announced on an earlier cycle: no rewrite, no second message
+    legacy = {n["job_id"]: make_job_id_legacy(n["url"]) for n in candidates}
+    known = await asyncio.to_thread(existing_job_ids, [*legacy, *legacy.values()])
 
-    job_id = make_job_id(url)
+    rows = [n for n in candidates if n["job_id"] not in known and legacy[n["job_id"]] not in known]
+    queued = [(n, n["job_id"]) for n in rows]
 
-    upsert_job(
-        job_id=job_id,
-        url=url,
-        title=strip_html(job.get("title", "")),
-        description=strip_html(job.get("short_description", "")),
-        budget=strip_html(job.get("budget", "")),
-        date=strip_html(job.get("date", "")),
-        proposal="",
-        status="pending_interest"
-    )
+    if not rows:
+        return
+
+    await asyncio.to_thread(upsert_jobs_batch, rows)
 
     if not telegram_enabled():
         return
 
-    def _enqueue():
-        try:
-            _queue.put_nowait((job, job_id))
-        except Exception as e:
-            print(f"[proposal_pipeline] ⚠️ No pude encolar mensaje: {e!r}")
+    global _enqueued
+    await start()
+    for item in queued:
+        await _queue.put(item)
+        _enqueued += 1
+        if _enqueued % QUEUE_LOG_EVERY == 0:
+            print(f"[proposal_pipeline] Cola Telegram: {_queue.qsize()}/{QUEUE_MAXSIZE} ({_enqueued} encolados)")
 
-    _loop.call_soon_threadsafe(_enqueue)
+async def handle_new_job(job: dict):
+    await handle_new_jobs([job])
@@ -2,8 +2,22 @@
 
 Avoid importing submodules with side-effects at package import time.
 Import `bootstrap` only when executed as a script to prevent double-run
-warnings when using `python -m huntly.workana.bootstrap`.
+warnings when using `python -m huntly.workana.bootstrap`. `scraper` and
+`sender` (and `compact_json`) are resolved lazily on first attribute access
+so `bootstrap` does not pay for requests/rich/playwright/the pipeline.
 """
-from . import scraper, sender
+import importlib
 
-__all__ = ["scraper", "sender"]
+__all__ = ["scraper", "sender", "compact_json"]
+
+
+def __getattr__(name):
+    if name in ("scraper", "sender"):
+        mod = importlib.import_module(f".{name}", __name__)
+        globals()[name] = mod
+        return mod
+    if name == "compact_json":
+        from .scraper import compact_json
+        globals()[name] = compact_json
+        return compact_json
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,12 +1,13 @@
 import asyncio
-import os
 from pathlib import Path
+
+from .. import get as env_get
 from playwright.async_api import async_playwright
 
 # Allow override via env; default to repo_root/config/workana_state.json
 repo_root = Path(__file__).resolve().parents[2]
 # Support both names used in examples
-WORKANA_STATE = os.getenv("WORKANA_STATE") or os.getenv("WORKANA_STATE_FILE") or str(repo_root / "config" / "workana_state.json")
+WORKANA_STATE = env_get("WORKANA_STATE") or env_get("WORKANA_STATE_FILE") or str(repo_root / "config" / "workana_state.json")
 LOGIN_URL = "https://www.workana.com/login"
 
 async def main():
@@ -1,26 +1,29 @@
 """Workana scraper (moved into huntly.workana)."""
+import asyncio
+import atexit
 import csv
-import json
+import sys
 import random
 import time
 import re
-import os
+from collections import deque
+from functools import lru_cache
+from html import unescape
 from pathlib import Path
 from typing import List, Dict, Set
 from datetime import datetime
 from urllib.parse import urlparse, parse_qs, urlencode, urlunparse
 
+import orjson
 import requests
-from bs4 import BeautifulSoup
-from ..core import notifications
-from ..pipeline.proposal_pipeline import handle_new_job
+from urllib3.util.request import ACCEPT_ENCODING
+from .. import get as env_get
+from ..core.aio import run
+from ..core.http import new_session
 
-# Rich UI
+# Rich UI (Table/Panel are imported where used: headless runs never render them)
 from rich.console import Console
-from rich.table import Table
-from rich.panel import Panel
 from rich.status import Status
-from rich import box
 
 console = Console()
 
@@ -37,15 +40,31 @@ USER_AGENT_LIST = [
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:125.0) Gecko/20100101 Firefox/125.0",
 ]
 
-DELAY_MIN = 3
-DELAY_MAX = 7
+# Courtesy delay between page requests: the server's response time times
+# POLITENESS_FACTOR, clamped to [DELAY_MIN, DELAY_MAX], plus up to DELAY_JITTER
+DELAY_MIN = 1.0
+DELAY_MAX = 10.0
+DELAY_JITTER = 0.5
+POLITENESS_FACTOR = 10.0
+# After a 429/503 the delay doubles (up to 8x) for this many requests
+THROTTLE_BACKOFF_REQUESTS = 3
+# Pages whose jobs may still be waiting on the DB/Telegram queue; past this the
+# scraper waits for the oldest one, so a slow Telegram throttles pagination
+MAX_PENDING_PAGES = 2
+
+# Batched notifications stay well below Telegram's 4096-char message limit
+MESSAGE_CHUNK_LIMIT = 3500
+
+_NUM = re.compile(r"\d+")
+_PAGE = re.compile(r"page=\d+")
 
 # Default output files (can be overridden by env)
 # Place outputs inside repo_root/data by default
 repo_root = Path(__file__).resolve().parents[2]
 DATA_DIR = repo_root / "data"
 CSV_OUTPUT_DEFAULT = DATA_DIR / "workana_jobs.csv"
-JSON_OUTPUT_DEFAULT = DATA_DIR / "workana_jobs.json"
+JSON_OUTPUT_DEFAULT = DATA_DIR / "workana_jobs.jsonl"
+CSV_FIELDS = ["title", "short_description", "budget", "date", "url", "platform"]
 
 # ---------------------------------------------------------------------------
 # Helpers
@@ -55,6 +74,9 @@ def normalize_url(url: str) -> str:
     """Remove tracking parameters and normalize URL for deduplication."""
     if not url:
         return ""
+    # Usual case (plain /job/<slug> link): nothing to strip but a trailing slash
+    if url.startswith(("https://", "http://")) and "?" not in url and "#" not in url and ";" not in url:
+        return url.rstrip("/")
     
     try:
         parsed = urlparse(url)
@@ -101,89 +123,266 @@ def extract_job_id(url: str) -> str | None:
 def get_headers() -> dict:
     return {"User-Agent": random.choice(USER_AGENT_LIST)}
 
-def polite_sleep():
-    time.sleep(random.uniform(DELAY_MIN, DELAY_MAX))
-
-def load_seen_urls(csv_path: Path) -> Set[str]:
+# Scraper-owned session, shared by every page and watch cycle so the pooled
+# TLS connection to workana.com is reused; the User-Agent is picked once
+SESSION = new_session()
+SESSION.headers.update(get_headers())
+SESSION.headers.update({
+    "Accept": "text/html,application/xhtml+xml",
+    "Accept-Language": "es-ES,es;q=0.9",
+    # gzip/deflate plus br (and zstd) only when urllib3 can actually decode them
+    "Accept-Encoding": ACCEPT_ENCODING,
+    "Connection": "keep-alive",
+})
+
+def seen_path_for(csv_path: Path) -> Path:
+    """Sidecar with one seen URL per line, kept next to the CSV."""
+    return csv_path.with_suffix(".seen")
+
+def _read_csv_urls(csv_path: Path) -> Set[str]:
     seen = set()
     if csv_path.exists():
         try:
-            with csv_path.open("r", encoding="utf-8") as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    url = (row.get("url") or "").strip()
-                    if url:
-                        seen.add(url)
+            with csv_path.open("r", encoding="utf-8", newline="") as f:
+                reader = csv.reader(f)
+                header = next(reader, None)
+                if header and "url" in header:
+                    ui = header.index("url")
+                    seen = {row[ui].strip() for row in reader if len(row) > ui and row[ui].strip()}
         except Exception as exc:
             console.print(f"[bold yellow][WARN][/bold yellow] Could not load existing CSV: {exc}")
     return seen
 
-def parse_age_to_hours(date_str: str) -> float:
-    low_date = (date_str or "").lower()
+def load_seen_urls(csv_path: Path) -> Set[str]:
+    seen_path = seen_path_for(csv_path)
+    if not csv_path.exists():
+        # Deleting the CSV resets deduplication: drop the now stale sidecar too
+        try:
+            seen_path.unlink(missing_ok=True)
+        except OSError as exc:
+            console.print(f"[bold yellow][WARN][/bold yellow] Could not remove {seen_path.name}: {exc}")
+        return set()
+
+    # The sidecar is appended right after the CSV, so one at least as new is complete
     try:
-        if "minuto" in low_date:
-            match = re.search(r"(\d+)", low_date)
-            return int(match.group(1)) / 60 if match else 0
-        elif "hora" in low_date:
-            match = re.search(r"(\d+)", low_date)
-            return float(match.group(1)) if match else 1.0
-        elif "ayer" in low_date:
-            return 24.0
-        elif "día" in low_date or "dia" in low_date:
-            match = re.search(r"(\d+)", low_date)
-            return float(match.group(1)) * 24 if match else 24.0
-    except Exception:
+        if seen_path.exists() and seen_path.stat().st_mtime >= csv_path.stat().st_mtime:
+            return set(filter(None, seen_path.read_text(encoding="utf-8").splitlines()))
+    except OSError:
         pass
+
+    # Missing or stale (CSV written by an older version or edited by hand): rebuild it
+    seen = _read_csv_urls(csv_path)
+    try:
+        seen_path.write_text("".join(u + "\n" for u in seen), encoding="utf-8")
+    except OSError as exc:
+        console.print(f"[bold yellow][WARN][/bold yellow] Could not write {seen_path.name}: {exc}")
+    return seen
+
+# (substring, minutes per unit, hours when no number is given); first match wins.
+# A None unit means the keyword alone fixes the age. Ordered by how often each
+# shows up in listings ("Hace N horas" dominates), so most lookups stop early.
+_AGE_UNITS = (
+    ("hora", 60, 1.0),
+    ("minuto", 1, 0.0),
+    ("día", 1440, 24.0),
+    ("dia", 1440, 24.0),
+    ("ayer", None, 24.0),
+)
+
+# Pure, and a cycle sees the same few strings ("Hace 2 horas") over and over
+@lru_cache(maxsize=256)
+def parse_age_to_hours(date_str: str) -> float:
+    low_date = (date_str or "").lower()
+    for key, unit, default in _AGE_UNITS:
+        if key in low_date:
+            if unit is None:
+                return default
+            match = _NUM.search(low_date)
+            return int(match.group()) * unit / 60 if match else default
     return 999.0
 
-def fetch_page(url: str, session: requests.Session) -> str | None:
+def fetch_page(url: str, session: requests.Session) -> tuple[bytes | None, float, bool]:
+    """Return `(body, elapsed_seconds, throttled)` for `url`.
+
+    The body is raw bytes (parse_jobs scans them directly) or None on error.
+    `throttled` is True if the server answered 429/503 at any point, including
+    attempts the session's Retry already absorbed.
+    """
+    start = time.monotonic()
     try:
-        response = session.get(url, headers=get_headers(), timeout=10)
+        response = session.get(url, timeout=10)
+        retries = getattr(response.raw, "retries", None)
+        throttled = response.status_code in (429, 503) or any(
+            h.status in (429, 503) for h in getattr(retries, "history", ())
+        )
         response.raise_for_status()
-        return response.text
+        return response.content, time.monotonic() - start, throttled
     except requests.RequestException as exc:
         console.print(f"[bold red][ERROR][/bold red] Failed to fetch {url}: {exc}")
-        return None
+        status = getattr(exc.response, "status_code", None)
+        throttled = status in (429, 503) or isinstance(exc, requests.exceptions.RetryError)
+        return None, time.monotonic() - start, throttled
+
+def format_job_message(job: Dict[str, str]) -> str:
+    return (
+        f"💼 <b>Título:</b> {job['title']}\n"
+        f"💰 <b>Presupuesto:</b> {job['budget']}\n"
+        f"📅 <b>Fecha:</b> {job['date']}\n"
+        f"🔗 <b>Link:</b> {job['url']}\n\n"
+        f"📝 <b>Descripción:</b> {job['short_description'][:200]}..."
+    )
+
+def chunk_messages(blocks: List[str], limit: int = MESSAGE_CHUNK_LIMIT) -> List[str]:
+    """Join message blocks into as few messages as possible, each under `limit` chars."""
+    chunks: List[str] = []
+    cur = ""
+    for block in blocks:
+        if cur and len(cur) + len(block) + 2 > limit:
+            chunks.append(cur)
+            cur = ""
+        cur = f"{cur}\n\n{block}" if cur else block
+    if cur:
+        chunks.append(cur)
+    return chunks
+
+async def fetch_page_async(session: requests.Session, url: str) -> tuple[bytes | None, float, bool]:
+    """Run the blocking fetch off the event loop (keeps the pooled/retrying Session)."""
+    return await asyncio.to_thread(fetch_page, url, session)
+
+class AdaptiveDelay:
+    """Courtesy delay that follows the server: fast answers mean short waits,
+    slow answers or throttling (429/503) mean longer ones."""
+
+    def __init__(self, factor: float = POLITENESS_FACTOR):
+        self.factor = factor
+        self._mult = 1
+        self._backoff_left = 0
+
+    def next_delay(self, elapsed: float, throttled: bool = False) -> float:
+        if throttled:
+            self._mult = min(self._mult * 2, 8)
+            self._backoff_left = THROTTLE_BACKOFF_REQUESTS
+        elif self._backoff_left:
+            self._backoff_left -= 1
+        else:
+            self._mult = 1
+        delay = max(DELAY_MIN, min(elapsed * self.factor, DELAY_MAX)) * self._mult
+        return delay + random.uniform(0, DELAY_JITTER)
+
+def polite_sleep(elapsed: float = 0.0) -> None:
+    """Blocking courtesy delay for external callers, after a request that took `elapsed` seconds."""
+    time.sleep(AdaptiveDelay().next_delay(elapsed))
+
+async def _fetch_polite(sem: asyncio.Semaphore, session: requests.Session, url: str, delay: AdaptiveDelay) -> bytes | None:
+    """Fetch `url` in one of the politeness slots.
+
+    The page is returned as soon as it arrives, but the slot stays taken for
+    the courtesy delay, so at most `concurrency` requests start per delay window.
+    """
+    await sem.acquire()
+    try:
+        html, elapsed, throttled = await fetch_page_async(session, url)
+    except BaseException:
+        sem.release()
+        raise
+    asyncio.get_running_loop().call_later(delay.next_delay(elapsed, throttled), sem.release)
+    return html
+
+async def process_page(new_jobs: List[Dict[str, str]]) -> None:
+    """Persist/enqueue a page's new jobs while the scraper moves on."""
+    # The pipeline pulls in python-telegram-bot/httpx and needs the Telegram
+    # config, so parsing/compact_json callers never pay for it
+    from ..pipeline.proposal_pipeline import handle_new_jobs
+    await handle_new_jobs(new_jobs)
+
+async def notify_digest(jobs: List[Dict[str, str]], notify_config: dict) -> None:
+    """Send the cycle's new jobs as one digest, split only past MESSAGE_CHUNK_LIMIT."""
+    from ..core import notifications
+    n = len(jobs)
+    subject = "🆕 ¡Nuevo Trabajo Encontrado! 🚀" if n == 1 else f"🆕 ¡{n} Nuevos Trabajos Encontrados! 🚀"
+    header = f"🏁 Ciclo de scraping finalizado: <b>{n}</b> nuevos trabajos en esta pasada."
+    # Sequential so multi-part digests arrive in order
+    for chunk in chunk_messages([header] + [format_job_message(job) for job in jobs]):
+        await notifications.notify_async(subject, chunk, notify_config)
 
 # ---------------------------------------------------------------------------
 # Parsing
 # ---------------------------------------------------------------------------
 
-def parse_jobs(html: str) -> List[Dict[str, str]]:
+# Outer page: the results JSON is a single attribute, so skip building a DOM for it
+_RESULTS_RE = re.compile(rb':results-initials="([^"]*)"')
+# Reused for every per-item title fragment; created on first parse
+_TITLE_PARSER = None
+# Fast path for the usual `<span title="..."><a href="...">text</a></span>` shape
+_SPAN_TITLE_RE = re.compile(r'<span[^>]*\stitle="([^"]+)"')
+_A_RE = re.compile(r'<a[^>]*\shref="([^"]+)"[^>]*>([^<]*)</a>')
+
+def parse_jobs(html: bytes | str) -> List[Dict[str, str]]:
     """
     Workana embeds results in a <search> tag attribute ':results-initials' (JSON).
+    Takes the raw response bytes; only the attribute value is ever decoded.
     """
-    soup = BeautifulSoup(html, "html.parser")
+    # Imported here so importing the scraper (e.g. from the bot) stays cheap
+    import lxml.html
+    global _TITLE_PARSER
+
     jobs: List[Dict[str, str]] = []
 
-    search_tag = soup.find("search")
-    if not search_tag:
-        return []
+    if isinstance(html, str):
+        html = html.encode("utf-8")
 
-    results_attr = search_tag.get(":results-initials")
+    m = _RESULTS_RE.search(html)
+    if m:
+        results_attr = unescape(m.group(1).decode("utf-8", "replace"))
+    else:
+        # Unusual quoting/markup: let lxml find the attribute
+        try:
+            tree = lxml.html.fromstring(html)
+        except Exception:
+            return []
+        results_attr = str(tree.xpath("string(//search/@*[local-name()=':results-initials'])"))
     if not results_attr:
         return []
 
     try:
-        data = json.loads(results_attr)
+        data = orjson.loads(results_attr)
         results = data.get("results", [])
     except Exception:
         return []
 
     for item in results:
-        title_html = item.get("title", "")
-        title_soup = BeautifulSoup(title_html, "html.parser")
-        title_tag = title_soup.find("span") or title_soup.find("a")
-        title = title_tag.get("title") or title_tag.get_text(strip=True) if title_tag else "N/A"
-
-        link_tag = title_soup.find("a")
-        if link_tag and link_tag.get("href"):
-            link = link_tag.get("href")
-            if link.startswith("/"):
-                link = "https://www.workana.com" + link
+        title_html = item.get("title", "") or ""
+        # The slug is structured data: build the link from it, only read the
+        # href out of the title markup when it is missing
+        slug = item.get("slug")
+        link = f"https://www.workana.com/job/{slug}" if slug else None
+        href = None
+
+        if "<" not in title_html:
+            # Plain-text title: nothing to parse
+            title = unescape(title_html).strip() or "N/A"
         else:
-            slug = item.get("slug")
-            link = f"https://www.workana.com/job/{slug}" if slug else None
+            m_t = _SPAN_TITLE_RE.search(title_html)
+            m_a = _A_RE.search(title_html)
+            if m_a and (m_t or m_a.group(2).strip()):
+                # Span title when present, else the link text
+                title = unescape(m_t.group(1) if m_t else m_a.group(2).strip())
+                href = unescape(m_a.group(1))
+            else:
+                if _TITLE_PARSER is None:
+                    _TITLE_PARSER = lxml.html.HTMLParser()
+                title_root = lxml.html.fragment_fromstring(title_html, create_parent="div", parser=_TITLE_PARSER)
+                title_tag = title_root.find(".//span")
+                if title_tag is None:
+                    title_tag = title_root.find(".//a")
+                title = (title_tag.get("title") or title_tag.text_content().strip()) if title_tag is not None else "N/A"
+
+                link_tag = title_root.find(".//a")
+                if link_tag is not None:
+                    href = link_tag.get("href")
+
+        if link is None and href:
+            link = "https://www.workana.com" + href if href.startswith("/") else href
 
         if not link or not str(link).startswith("http"):
             continue
@@ -209,10 +408,135 @@ def parse_jobs(html: str) -> List[Dict[str, str]]:
 
 def build_page_url(base_url: str, page_number: int) -> str:
     if "page=" in base_url:
-        return re.sub(r"page=\d+", f"page={page_number}", base_url)
+        return _PAGE.sub(f"page={page_number}", base_url)
     separator = "&" if "?" in base_url else "?"
     return f"{base_url}{separator}page={page_number}"
 
+# ---------------------------------------------------------------------------
+# JSON output
+# ---------------------------------------------------------------------------
+
+def compact_json(jsonl_path: Path = JSON_OUTPUT_DEFAULT, json_path: Path | None = None) -> Path:
+    """Rebuild the legacy indented JSON array from the JSON Lines output.
+
+    Records are deduplicated by URL (first occurrence wins). Returns the path written.
+    """
+    json_path = json_path or jsonl_path.with_suffix(".json")
+    jobs: List[Dict[str, str]] = []
+    urls: Set[str] = set()
+    with jsonl_path.open("rb") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            job = orjson.loads(line)
+            url = job.get("url")
+            if url in urls:
+                continue
+            urls.add(url)
+            jobs.append(job)
+    json_path.write_bytes(orjson.dumps(jobs, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+    return json_path
+
+JSON_FORMATS = ("jsonl", "array")
+
+def json_format_for(json_path: Path) -> str:
+    """Default output format: legacy JSON array for `.json`, JSON Lines otherwise."""
+    return "array" if json_path.suffix.lower() == ".json" else "jsonl"
+
+# Array mode keeps the whole array in memory after the first load and rewrites
+# the file every JSON_FLUSH_EVERY cycles (and at exit) instead of every cycle
+_flush_every = (env_get("JSON_FLUSH_EVERY") or "").strip()
+JSON_FLUSH_EVERY = int(_flush_every) if _flush_every.isdigit() and int(_flush_every) > 0 else 5
+_json_cache: Dict[Path, tuple] = {}   # path -> (jobs, urls)
+_json_pending: Dict[Path, int] = {}   # path -> writes not yet on disk
+
+def write_json_array(json_path: Path, new_jobs: List[Dict[str, str]]) -> None:
+    """Legacy array format: merge `new_jobs` (by URL) into the cached array."""
+    cached = _json_cache.get(json_path)
+    if cached is None:
+        jobs: List[Dict[str, str]] = []
+        if json_path.exists():
+            try:
+                data = orjson.loads(json_path.read_bytes())
+            except (orjson.JSONDecodeError, OSError) as exc:
+                console.print(f"[bold yellow][WARN][/bold yellow] Could not load existing JSON: {exc}")
+            else:
+                if isinstance(data, list):
+                    jobs = data
+                else:
+                    console.print(f"[bold yellow][WARN][/bold yellow] Could not load existing JSON: {json_path.name} is not an array")
+        cached = _json_cache[json_path] = (jobs, {j.get("url") for j in jobs})
+    jobs, urls = cached
+    for j in new_jobs:
+        url = j.get("url")
+        if url not in urls:
+            urls.add(url)
+            jobs.append(j)
+    _json_pending[json_path] = _json_pending.get(json_path, 0) + 1
+    if _json_pending[json_path] >= JSON_FLUSH_EVERY:
+        flush_json(json_path)
+
+def flush_json(json_path: Path | None = None) -> None:
+    """Write cached JSON arrays with unsaved jobs to disk (all of them by default)."""
+    for path in ([json_path] if json_path else list(_json_pending)):
+        if _json_pending.get(path):
+            try:
+                path.write_bytes(orjson.dumps(_json_cache[path][0], option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+            except OSError as exc:
+                console.print(f"[bold yellow][WARN][/bold yellow] Could not write {path}: {exc}")
+                continue
+            _json_pending[path] = 0
+
+atexit.register(flush_json)
+
+class CsvSink:
+    """Append-only CSV writer that keeps one buffered handle open across cycles.
+
+    The header is written lazily, only when the file starts out empty. URLs are
+    mirrored into the `.seen` sidecar so startup does not have to parse the CSV.
+    """
+
+    def __init__(self, path: Path, buffering: int = 1 << 16):
+        self.path = path
+        self.buffering = buffering
+        self._f = None
+        self._seen_f = None
+        self._writer = None
+
+    def _open(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._f = self.path.open("a", buffering=self.buffering, newline="", encoding="utf-8")
+        self._writer = csv.DictWriter(self._f, fieldnames=CSV_FIELDS)
+        seen_path = seen_path_for(self.path)
+        if self._f.tell() == 0:
+            self._writer.writeheader()
+            # Fresh CSV: whatever an old sidecar lists is no longer in it
+            self._seen_f = seen_path.open("w", encoding="utf-8")
+            return
+        if not seen_path.exists():
+            # Seed the sidecar with the rows already in the CSV before appending to it
+            load_seen_urls(self.path)
+        self._seen_f = seen_path.open("a", encoding="utf-8")
+
+    def write_rows(self, rows: List[Dict[str, str]]) -> None:
+        if self._f is None:
+            self._open()
+        self._writer.writerows(rows)
+        self._seen_f.write("".join(u + "\n" for u in ((r.get("url") or "").strip() for r in rows) if u))
+
+    def flush(self) -> None:
+        # CSV first: a sidecar at least as new as the CSV is trusted on startup
+        if self._f is not None:
+            self._f.flush()
+            self._seen_f.flush()
+
+    def close(self) -> None:
+        if self._f is not None:
+            self._f.close()
+            self._seen_f.close()
+            self._f = self._seen_f = self._writer = None
+
 # ---------------------------------------------------------------------------
 # Main scrape
 # ---------------------------------------------------------------------------
@@ -225,142 +549,251 @@ def scrape(
     notify_config: dict | None,
     seen_urls: Set[str],
     max_age_hours: float | None,
+    concurrency: int = 1,
+    csv_sink: CsvSink | None = None,
+    json_format: str | None = None,
+    stop_on_no_new: bool = True,
+    politeness_factor: float = POLITENESS_FACTOR,
+) -> List[Dict[str, str]]:
+    """Blocking wrapper around `scrape_async`.
+
+    Each call runs on its own event loop, so queued Telegram messages are sent
+    and the Telegram clients closed before returning. A JSON array output is
+    also flushed to disk.
+    """
+    async def _once() -> List[Dict[str, str]]:
+        try:
+            return await scrape_async(
+                start_url=start_url,
+                csv_path=csv_path,
+                json_path=json_path,
+                max_pages=max_pages,
+                notify_config=notify_config,
+                seen_urls=seen_urls,
+                max_age_hours=max_age_hours,
+                concurrency=concurrency,
+                csv_sink=csv_sink,
+                json_format=json_format,
+                stop_on_no_new=stop_on_no_new,
+                politeness_factor=politeness_factor,
+            )
+        finally:
+            flush_json()
+            # Only loaded if some page had new jobs
+            pipeline = sys.modules.get("huntly.pipeline.proposal_pipeline")
+            if pipeline is not None:
+                await pipeline.drain()
+                await pipeline.aclose()
+            # Only loaded if a digest was sent; its client is bound to this loop
+            notifications = sys.modules.get("huntly.core.notifications")
+            if notifications is not None:
+                await notifications.aclose()
+    return run(_once())
+
+async def scrape_async(
+    start_url: str,
+    csv_path: Path,
+    json_path: Path | None,
+    max_pages: int | None,
+    notify_config: dict | None,
+    seen_urls: Set[str],
+    max_age_hours: float | None,
+    concurrency: int = 1,
+    csv_sink: CsvSink | None = None,
+    json_format: str | None = None,
+    stop_on_no_new: bool = True,
+    politeness_factor: float = POLITENESS_FACTOR,
 ) -> List[Dict[str, str]]:
-    session = requests.Session()
+    """Scrape `start_url` page by page and persist the jobs not in `seen_urls`.
+
+    `seen_urls` may be any set-like object with `in`/`add` (e.g. a BloomFilter).
+    Pass a long-lived `csv_sink` (watch mode) to keep the CSV open between
+    cycles; without one the file is opened and closed for this call.
+    `json_format` is "jsonl" or "array" (default: from the `json_path` suffix);
+    the array is only rewritten every JSON_FLUSH_EVERY calls, so call
+    `flush_json()` when done (`scrape` and `run_async` do).
+    With `stop_on_no_new`, pagination ends at the first page after page 1
+    that brings no unseen jobs. `politeness_factor` scales the courtesy delay
+    with each page's response time (see AdaptiveDelay).
+    """
+    # The pipeline checks the Telegram config at import: load it before the first
+    # fetch so missing TG_* fails fast instead of halfway through a cycle
+    from ..pipeline import proposal_pipeline
+
+    session = SESSION
     all_jobs: List[Dict[str, str]] = []
+    # Page processing runs while we wait out the polite delay before the next fetch;
+    # at most MAX_PENDING_PAGES of it is outstanding (backpressure from the queue)
+    pending: List[asyncio.Task] = []
+
+    # Up to `concurrency` upcoming pages are fetched ahead of the one being
+    # parsed; pages are still consumed in order so the early stops below hold
+    concurrency = max(1, concurrency)
+    sem = asyncio.Semaphore(concurrency)
+    delay = AdaptiveDelay(politeness_factor)
+    prefetch: deque[tuple[int, asyncio.Task]] = deque()
+    next_page = 1
+
+    def schedule() -> None:
+        nonlocal next_page
+        while len(prefetch) < concurrency and not (max_pages and next_page > max_pages):
+            url = build_page_url(start_url, next_page)
+            prefetch.append((next_page, asyncio.create_task(_fetch_polite(sem, session, url, delay))))
+            next_page += 1
 
-    page = 1
     consecutive_empty_pages = 0  # Track pages with no new jobs
     max_consecutive_empty = 3    # Stop after N consecutive empty pages
+    filter_age = max_age_hours is not None  # Checked per job: evaluate once
+    # Interactive runs get one table per cycle; logs/pipes just one line per page
+    is_tty = console.is_terminal
+    job_pages: List[int] = []
     
     with Status("[bold blue]Iniciando scraping...", console=console) as status:
-        while True:
-            url = build_page_url(start_url, page)
-            status.update(f"[bold blue]Procesando página {page}...")
-
-            html = fetch_page(url, session)
-            if html is None:
-                break
-
-            page_jobs = parse_jobs(html)
-            if not page_jobs:
-                console.print(f"[yellow][INFO][/yellow] No se encontraron más trabajos en la página {page}.")
-                break
-
-            new_jobs: List[Dict[str, str]] = []
-            filtered_by_age = 0
-
-            for job in page_jobs:
-                job_url = (job.get("url") or "").strip()
-                if not job_url:
-                    continue
-
-                # Normalize URL for deduplication
-                normalized_url = normalize_url(job_url)
-                job_id = extract_job_id(normalized_url)
+        try:
+            try:
+                while True:
+                    schedule()
+                    if not prefetch:
+                        break
+                    page, fetch = prefetch.popleft()
+                    status.update(f"[bold blue]Procesando página {page}...")
+
+                    html = await fetch
+                    if html is None:
+                        break
+
+                    page_jobs = parse_jobs(html)
+                    if not page_jobs:
+                        console.print(f"[yellow][INFO][/yellow] No se encontraron más trabajos en la página {page}.")
+                        break
+
+                    new_jobs: List[Dict[str, str]] = []
+                    filtered_by_age = 0
+                    # Per-job loop: bind the globals/methods it hits to locals
+                    normalize, job_id_of, age_of = normalize_url, extract_job_id, parse_age_to_hours
+                    add_new, add_seen = new_jobs.append, seen_urls.add
+
+                    for job in page_jobs:
+                        job_url = (job.get("url") or "").strip()
+                        if not job_url:
+                            continue
+
+                        # Normalize URL for deduplication
+                        normalized_url = normalize(job_url)
+                        job_id = job_id_of(normalized_url)
                 
-                # Check both normalized URL and job ID for duplicates
-                is_duplicate = normalized_url in seen_urls or (job_id and job_id in seen_urls)
+                        # Check both normalized URL and job ID for duplicates
+                        is_duplicate = normalized_url in seen_urls or (job_id and job_id in seen_urls)
                 
-                if is_duplicate:
-                    console.print(f"[dim]⏭️  Omitiendo duplicado: {job['title'][:60]}...[/dim]")
-                    continue
-
-                if max_age_hours is not None:
-                    job_age = parse_age_to_hours(job.get("date", ""))
-                    if job_age > max_age_hours:
-                        filtered_by_age += 1
-                        continue
-
-                new_jobs.append(job)
-                seen_urls.add(normalized_url)
-                if job_id:
-                    seen_urls.add(job_id)
-
-
-            all_jobs.extend(new_jobs)
-
-            if filtered_by_age > 0 and max_age_hours is not None:
-                console.print(f"[dim]Página {page}: {filtered_by_age} trabajos omitidos por ser más antiguos de {max_age_hours} horas.[/dim]")
-
-            # Early exit: if this page has no new jobs, increment counter
-            if not new_jobs:
-                consecutive_empty_pages += 1
-                # If we have max_age_hours filter and all jobs were filtered by age, likely older pages will be too
-                if max_age_hours is not None and filtered_by_age > 0 and consecutive_empty_pages >= max_consecutive_empty:
-                    console.print(f"[yellow][INFO][/yellow] Se encontraron {consecutive_empty_pages} páginas consecutivas sin trabajos nuevos. Deteniendo búsqueda.")
-                    break
-            else:
-                # Reset counter when we find new jobs
-                consecutive_empty_pages = 0
-
-            if new_jobs:
-                table = Table(
-                    title=f"Nuevos Trabajos - Página {page}",
-                    box=box.ROUNDED,
-                    show_header=True,
-                    header_style="bold magenta"
-                )
-                table.add_column("Título", style="cyan", no_wrap=False)
-                table.add_column("Presupuesto", style="green")
-                table.add_column("Fecha", style="dim")
-
-                for job in new_jobs:
-                    handle_new_job(job)
-                    table.add_row(job["title"], job["budget"], job["date"])
-
-                console.print(table)
-
-                if notify_config and notify_config.get("notify_email"):
-                    for job in new_jobs:
-                        msg = (
-                            f"💼 <b>Título:</b> {job['title']}\n"
-                            f"💰 <b>Presupuesto:</b> {job['budget']}\n"
-                            f"📅 <b>Fecha:</b> {job['date']}\n"
-                            f"🔗 <b>Link:</b> {job['url']}\n\n"
-                            f"📝 <b>Descripción:</b> {job['short_description'][:200]}..."
-                        )
-                        notifications.notify("🆕 ¡Nuevo Trabajo Encontrado! 🚀", msg, notify_config)
-            else:
-                console.print(f"[dim]Página {page}: sin nuevos trabajos[/dim]")
+                        if is_duplicate:
+                            console.print(f"[dim]⏭️  Omitiendo duplicado: {job['title'][:60]}...[/dim]")
+                            continue
+
+                        if filter_age:
+                            job_age = age_of(job.get("date", ""))
+                            if job_age > max_age_hours:
+                                filtered_by_age += 1
+                                continue
+
+                        add_new(job)
+                        add_seen(normalized_url)
+                        if job_id:
+                            add_seen(job_id)
+
+                    all_jobs.extend(new_jobs)
+
+                    if filtered_by_age > 0 and filter_age:
+                        console.print(f"[dim]Página {page}: {filtered_by_age} trabajos omitidos por ser más antiguos de {max_age_hours} horas.[/dim]")
+
+                    # Early exit: if this page has no new jobs, increment counter
+                    if not new_jobs:
+                        consecutive_empty_pages += 1
+                        # If we have max_age_hours filter and all jobs were filtered by age, likely older pages will be too
+                        if filter_age and filtered_by_age > 0 and consecutive_empty_pages >= max_consecutive_empty:
+                            console.print(f"[yellow][INFO][/yellow] Se encontraron {consecutive_empty_pages} páginas consecutivas sin trabajos nuevos. Deteniendo búsqueda.")
+                            break
+                    else:
+                        # Reset counter when we find new jobs
+                        consecutive_empty_pages = 0
+
+                    # Results are sorted by recency: once a whole page is too old, or
+                    # (past page 1, in case of reordering at the top) already seen,
+                    # every later page will be too
+                    if filter_age and filtered_by_age == len(page_jobs):
+                        console.print(f"[yellow][INFO][/yellow] Página {page}: todos los trabajos superan las {max_age_hours} horas. Deteniendo búsqueda.")
+                        break
+                    if stop_on_no_new and not new_jobs and page > 1:
+                        console.print(f"[dim]Página {page}: sin nuevos trabajos. Deteniendo búsqueda.[/dim]")
+                        break
+
+                    if new_jobs:
+                        if is_tty:
+                            job_pages.extend([page] * len(new_jobs))
+                        else:
+                            console.print(f"[yellow][INFO][/yellow] Página {page}: {len(new_jobs)} nuevos trabajos")
+
+                        if len(pending) >= MAX_PENDING_PAGES:
+                            status.update("[bold blue]Esperando a las notificaciones...")
+                            await pending.pop(0)
+                        pending.append(asyncio.create_task(process_page(new_jobs)))
+                    else:
+                        console.print(f"[dim]Página {page}: sin nuevos trabajos[/dim]")
+            finally:
+                # Pages fetched past the stopping point are not needed
+                for _, fetch in prefetch:
+                    fetch.cancel()
+
+            # Persist the cycle before waiting on Telegram, so a failure there
+            # cannot lose jobs already marked as seen
+            if all_jobs:
+                sink = csv_sink or CsvSink(csv_path)
+                try:
+                    sink.write_rows(all_jobs)
+                    sink.flush()
+                finally:
+                    if sink is not csv_sink:
+                        sink.close()
+
+                if json_path:
+                    json_path.parent.mkdir(parents=True, exist_ok=True)
+                    if (json_format or json_format_for(json_path)) == "array":
+                        write_json_array(json_path, all_jobs)
+                    else:
+                        # JSON Lines: append only the new records, dedup already happened via seen_urls
+                        with json_path.open("ab") as f:
+                            f.write(b"\n".join(orjson.dumps(j) for j in all_jobs) + b"\n")
+
+            if pending:
+                status.update("[bold blue]Finalizando notificaciones...")
+                await asyncio.gather(*pending)
+        except BaseException:
+            # Don't leave page tasks running after an error ends the cycle
+            for task in pending:
+                task.cancel()
+            raise
+
+    if is_tty and all_jobs:
+        from rich import box
+        from rich.table import Table
+
+        table = Table(
+            title=f"Nuevos Trabajos ({len(all_jobs)})",
+            box=box.ROUNDED,
+            show_header=True,
+            header_style="bold magenta"
+        )
+        table.add_column("Pág.", style="dim", justify="right")
+        table.add_column("Título", style="cyan", no_wrap=False)
+        table.add_column("Presupuesto", style="green")
+        table.add_column("Fecha", style="dim")
 
-            status.update("[bold dim]Esperando intervalo de cortesía...")
-            polite_sleep()
+        for pg, job in zip(job_pages, all_jobs):
+            table.add_row(str(pg), job["title"], job["budget"], job["date"])
 
-            page += 1
-            if max_pages and page > max_pages:
-                break
+        console.print(table)
 
     if all_jobs:
-        csv_path.parent.mkdir(parents=True, exist_ok=True)
-        file_exists = csv_path.exists()
-
-        with csv_path.open("a" if file_exists else "w", newline="", encoding="utf-8") as f:
-            writer = csv.DictWriter(f, fieldnames=["title", "short_description", "budget", "date", "url", "platform"])
-            if not file_exists:
-                writer.writeheader()
-            writer.writerows(all_jobs)
-
-        if json_path:
-            json_path.parent.mkdir(parents=True, exist_ok=True)
-            full_data = list(all_jobs)
-
-            if json_path.exists():
-                try:
-                    with json_path.open("r", encoding="utf-8") as f:
-                        old_data = json.load(f)
-                        if isinstance(old_data, list):
-                            old_urls = {j.get("url") for j in old_data}
-                            for j in all_jobs:
-                                if j.get("url") not in old_urls:
-                                    old_data.append(j)
-                            full_data = old_data
-                except Exception:
-                    pass
-
-            with json_path.open("w", encoding="utf-8") as f:
-                json.dump(full_data, f, ensure_ascii=False, indent=2)
-
+        from rich.panel import Panel
         console.print(Panel(
             f"[bold green]¡Éxito![/bold green]\n"
             f"Se guardaron [bold]{len(all_jobs)}[/bold] nuevos trabajos.\n"
@@ -371,20 +804,21 @@ def scrape(
         ))
 
         if notify_config and notify_config.get("notify_email"):
-            notifications.notify(
-                "🏁 Ciclo de Scraping Finalizado",
-                f"✅ Se encontraron un total de <b>{len(all_jobs)}</b> nuevos trabajos en esta pasada.",
-                notify_config
-            )
+            await notify_digest(all_jobs, notify_config)
 
     return all_jobs
 
-if __name__ == "__main__":
-    target_url = (os.getenv("URL") or DEFAULT_URL).strip()
+# ---------------------------------------------------------------------------
+# Entry points
+# ---------------------------------------------------------------------------
+
+async def run_async() -> None:
+    """Run the scraper (once, or forever in WATCH_MODE) on the current event loop."""
+    target_url = (env_get("URL") or DEFAULT_URL).strip()
 
     # Respect env vars but resolve simple filenames into the data directory
-    csv_env = os.getenv("CSV_FILE")
-    json_env = os.getenv("JSON_FILE")
+    csv_env = env_get("CSV_FILE")
+    json_env = env_get("JSON_FILE")
 
     def resolve_output(p: str, default: Path) -> Path:
         if not p:
@@ -398,20 +832,35 @@ if __name__ == "__main__":
     csv_path = resolve_output(csv_env, CSV_OUTPUT_DEFAULT)
     json_path = resolve_output(json_env, JSON_OUTPUT_DEFAULT) if (json_env or JSON_OUTPUT_DEFAULT) else None
 
-    max_pages_str = (os.getenv("MAX_PAGES") or "").strip()
+    max_pages_str = (env_get("MAX_PAGES") or "").strip()
     max_pages = int(max_pages_str) if max_pages_str.isdigit() else None
 
-    interval_str = (os.getenv("INTERVAL_MINUTES") or "10").strip()
+    interval_str = (env_get("INTERVAL_MINUTES") or "10").strip()
     interval = int(interval_str) if interval_str.isdigit() else 10
 
-    watch_mode = (os.getenv("WATCH_MODE") or "false").strip().lower() == "true"
+    watch_mode = (env_get("WATCH_MODE") or "false").strip().lower() == "true"
 
-    max_age_str = (os.getenv("MAX_AGE_HOURS") or "").strip()
+    max_age_str = (env_get("MAX_AGE_HOURS") or "").strip()
     max_age = float(max_age_str) if max_age_str else None
 
-    notify_email = (os.getenv("NOTIFY_EMAIL") or "false").strip().lower() == "true"
+    # JSON_FORMAT=array keeps the old single-array file; default follows the file suffix
+    json_format = (env_get("JSON_FORMAT") or "").strip().lower()
+    json_format = json_format if json_format in JSON_FORMATS else None
+
+    stop_on_no_new = (env_get("STOP_ON_NO_NEW") or "true").strip().lower() == "true"
+
+    try:
+        politeness_factor = float((env_get("POLITENESS_FACTOR") or "").strip() or POLITENESS_FACTOR)
+    except ValueError:
+        politeness_factor = POLITENESS_FACTOR
+
+    concurrency_str = (env_get("FETCH_CONCURRENCY") or "1").strip()
+    concurrency = int(concurrency_str) if concurrency_str.isdigit() else 1
+
+    notify_email = (env_get("NOTIFY_EMAIL") or "false").strip().lower() == "true"
     notify_config = {"notify_email": True} if notify_email else None
 
+    from rich.panel import Panel
     console.print(Panel(
         "[bold bright_white]Workana Scraper[/bold bright_white]\n"
         "[dim]Monitoreando la plataforma en tiempo real...[/dim]\n\n"
@@ -423,13 +872,26 @@ if __name__ == "__main__":
     ))
 
     seen = load_seen_urls(csv_path)
+    if (env_get("SEEN_BLOOM") or "false").strip().lower() == "true":
+        # Huge histories: trade the exact set for a ~10 bits/URL Bloom filter
+        from ..core.bloom import BloomFilter
+        capacity_str = (env_get("SEEN_BLOOM_CAPACITY") or "").strip()
+        capacity = int(capacity_str) if capacity_str.isdigit() and int(capacity_str) > 0 else 1_000_000
+        if 2 * len(seen) > capacity:
+            console.print(f"[bold yellow][WARN][/bold yellow] SEEN_BLOOM_CAPACITY={capacity} es poco para {len(seen)} URLs previas; se usa {2 * len(seen)}.")
+            capacity = 2 * len(seen)
+        bloom = BloomFilter(capacity)
+        bloom.update(seen)
+        seen = bloom
     if seen:
         console.print(f"[dim]Se cargaron {len(seen)} URLs previas para evitar duplicados.[/dim]")
 
-    def run_once():
+    csv_sink = CsvSink(csv_path)
+
+    async def run_once():
         now = datetime.now().strftime("%H:%M:%S")
         console.rule(f"[bold blue]Ciclo iniciado a las {now}[/bold blue]")
-        scrape(
+        await scrape_async(
             start_url=target_url,
             csv_path=csv_path,
             json_path=json_path,
@@ -437,16 +899,45 @@ if __name__ == "__main__":
             notify_config=notify_config,
             seen_urls=seen,
             max_age_hours=max_age,
+            concurrency=concurrency,
+            csv_sink=csv_sink,
+            json_format=json_format,
+            stop_on_no_new=stop_on_no_new,
+            politeness_factor=politeness_factor,
         )
+        if getattr(seen, "over_capacity", False):
+            console.print(f"[bold yellow][WARN][/bold yellow] El filtro Bloom superó su capacidad ({seen.capacity}); pueden omitirse trabajos nuevos. Sube SEEN_BLOOM_CAPACITY.")
 
-    if not watch_mode:
-        run_once()
-    else:
-        try:
+    try:
+        if not watch_mode:
+            await run_once()
+            # Let queued Telegram messages go out before the loop shuts down;
+            # the pipeline is only loaded (and TG_* required) if a page had new jobs
+            pipeline = sys.modules.get("huntly.pipeline.proposal_pipeline")
+            if pipeline is not None:
+                await pipeline.drain()
+        else:
             while True:
-                run_once()
+                await run_once()
                 next_run = datetime.fromtimestamp(time.time() + interval * 60).strftime("%H:%M:%S")
                 console.print(f"\n[bold dim]Próximo chequeo programado para las {next_run}...[/bold dim]")
-                time.sleep(interval * 60)
-        except KeyboardInterrupt:
-            console.print("\n[bold red]Scraper detenido por el usuario.[/bold red]")
+                await asyncio.sleep(interval * 60)
+    finally:
+        csv_sink.close()
+        flush_json()
+        pipeline = sys.modules.get("huntly.pipeline.proposal_pipeline")
+        if pipeline is not None:
+            await pipeline.aclose()
+        # Only loaded if a digest was sent this run
+        notifications = sys.modules.get("huntly.core.notifications")
+        if notifications is not None:
+            await notifications.aclose()
+
+def main() -> None:
+    try:
+        run(run_async())
+    except KeyboardInterrupt:
+        console.print("\n[bold red]Scraper detenido por el usuario.[/bold red]")
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,14 @@
+import asyncio
+
 from playwright.async_api import async_playwright
-import os
 from pathlib import Path
 
+from .. import get as env_get
+
 # Default path: repo_root/config/workana_state.json (override with WORKANA_STATE env)
 repo_root = Path(__file__).resolve().parents[2]
 # Support both names used in examples
-WORKANA_STATE = os.getenv("WORKANA_STATE") or os.getenv("WORKANA_STATE_FILE") or str(repo_root / "config" / "workana_state.json")
+WORKANA_STATE = env_get("WORKANA_STATE") or env_get("WORKANA_STATE_FILE") or str(repo_root / "config" / "workana_state.json")
 
 def to_message_url(u: str) -> str:
     if "/messages/bid/" in u:
@@ -18,12 +21,45 @@ def to_message_url(u: str) -> str:
         return f"https://www.workana.com/messages/bid/{slug}/?tab=message&ref=project_view"
     return u
 
+# Chromium is launched once and reused; each send only opens/closes a page
+_PW = None
+_BROWSER = None
+_CTX = None
+_LOCK = asyncio.Lock()
+
+async def _shutdown():
+    global _PW, _BROWSER, _CTX
+    try:
+        if _BROWSER is not None:
+            await _BROWSER.close()
+        if _PW is not None:
+            await _PW.stop()
+    except Exception:
+        pass
+    _PW = _BROWSER = _CTX = None
+
+async def _ensure():
+    global _PW, _BROWSER, _CTX
+    async with _LOCK:
+        if _BROWSER is not None and _BROWSER.is_connected():
+            return _CTX
+        # First use, or the window was closed: start from scratch
+        await _shutdown()
+        _PW = await async_playwright().start()
+        _BROWSER = await _PW.chromium.launch(headless=False, slow_mo=200)
+        _CTX = await _BROWSER.new_context(storage_state=str(WORKANA_STATE))
+        return _CTX
+
+async def close_browser():
+    """Close the shared browser (call on bot shutdown)."""
+    async with _LOCK:
+        await _shutdown()
+
 async def send_proposal_to_workana(job_or_message_url: str, proposal: str):
     url = to_message_url(job_or_message_url)
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=False, slow_mo=200)
-        context = await browser.new_context(storage_state=str(WORKANA_STATE))
-        page = await context.new_page()
+    context = await _ensure()
+    page = await context.new_page()
+    try:
         await page.goto(url, wait_until="domcontentloaded")
         textarea = page.locator("form textarea").first
         await textarea.wait_for(timeout=15000)
@@ -32,5 +68,6 @@ async def send_proposal_to_workana(job_or_message_url: str, proposal: str):
         await btn.wait_for(timeout=15000)
         await btn.click()
         await page.wait_for_timeout(1500)
-        await browser.close()
         return True
+    finally:
+        await page.close()